@@ -0,0 +1,342 @@
+"""
+SCRIPT: rollup.py
+PURPOSE: Headless team-wide rollup across many solsearch.db files.
+
+Each database is opened read-only and reduced to a small partial aggregate
+(status and priority counts) in a process pool. Partials are cached against
+file mtime and size, so re-runs only re-read databases that changed, and are
+then merged into one combined report (CSV and/or JSON, plus optional chart).
+
+USAGE:
+    python rollup.py team_dbs/ --csv rollup.csv --json rollup.json --chart rollup.png
+"""
+
+import sqlite3
+import os
+import sys
+import csv
+import json
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+DB_NAME = "solsearch.db"
+VALID_STATUSES = ["Applied", "Interview", "Rejected", "Offer"]
+PRIORITY_LEVELS = [1, 2, 3, 4, 5]
+CACHE_FILE = ".rollup_cache.json"
+CACHE_VERSION = 1
+
+# ==========================================
+# DISCOVERY
+# ==========================================
+def find_databases(paths):
+    """Expands files/directories into a sorted list of absolute db paths."""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name == DB_NAME:
+                        found.add(os.path.abspath(os.path.join(root, name)))
+        elif os.path.isfile(path):
+            found.add(os.path.abspath(path))
+        else:
+            print(f"Warning: {path} not found, skipping.", file=sys.stderr)
+    return sorted(found)
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+# ==========================================
+# WORKER (runs in child processes)
+# ==========================================
+def empty_partial():
+    return {
+        "total": 0,
+        "statuses": {s: 0 for s in VALID_STATUSES},
+        "priorities": {str(p): 0 for p in PRIORITY_LEVELS},
+    }
+
+def aggregate_database(path):
+    """Reduces one database to partial counts. Returns (path, partial, error)."""
+    partial = empty_partial()
+    try:
+        # mode=ro guarantees we never create or modify a teammate's file;
+        # as_uri() escapes '?', '#' and '%' so the mode applies to the real path
+        conn = sqlite3.connect(Path(path).as_uri() + "?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        return path, None, str(e)
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT status, COUNT(*) FROM applications GROUP BY status")
+        for status, count in cursor.fetchall():
+            partial["total"] += count
+            # Unknown statuses still count towards the total, like the dashboard
+            if status in partial["statuses"]:
+                partial["statuses"][status] += count
+
+        cursor.execute("SELECT priority, COUNT(*) FROM applications GROUP BY priority")
+        for priority, count in cursor.fetchall():
+            key = str(priority)
+            if key in partial["priorities"]:
+                partial["priorities"][key] += count
+    except sqlite3.Error as e:
+        return path, None, str(e)
+    finally:
+        conn.close()
+
+    return path, partial, None
+
+# ==========================================
+# CACHE
+# ==========================================
+def load_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    if not isinstance(files, dict):
+        return {}
+    # Drop malformed entries so those files are simply re-read
+    return {path: entry for path, entry in files.items() if is_valid_entry(entry)}
+
+def is_valid_entry(entry):
+    if not isinstance(entry, dict):
+        return False
+    if not isinstance(entry.get("mtime_ns"), int) or not isinstance(entry.get("size"), int):
+        return False
+    partial = entry.get("partial")
+    if not isinstance(partial, dict) or not isinstance(partial.get("total"), int):
+        return False
+    statuses = partial.get("statuses")
+    priorities = partial.get("priorities")
+    if not isinstance(statuses, dict) or set(statuses) != set(VALID_STATUSES):
+        return False
+    if not isinstance(priorities, dict) or set(priorities) != {str(p) for p in PRIORITY_LEVELS}:
+        return False
+    return all(isinstance(v, int) for v in list(statuses.values()) + list(priorities.values()))
+
+def save_cache(cache_path, entries):
+    """Atomically writes the cache. Failures only warn: the cache is an optimization."""
+    if not cache_path:
+        return
+    tmp_path = None
+    try:
+        # A unique temp file per run keeps concurrent rollups from interleaving writes
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir,
+                                         prefix=".rollup_cache.", suffix=".tmp",
+                                         delete=False) as f:
+            tmp_path = f.name
+            json.dump({"version": CACHE_VERSION, "files": entries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# ==========================================
+# ROLLUP
+# ==========================================
+def merge_partials(partials):
+    combined = empty_partial()
+    for partial in partials:
+        combined["total"] += partial["total"]
+        for status, count in partial["statuses"].items():
+            combined["statuses"][status] += count
+        for priority, count in partial["priorities"].items():
+            combined["priorities"][priority] += count
+    return combined
+
+def collect_partials(db_paths, cache, workers=None):
+    """
+    Returns (partials, new_cache, errors, reused).
+    Only databases whose (mtime, size) differ from the cache are re-read.
+    Entries for databases outside this run are kept, so separate rollups
+    can share one cache file; only entries for deleted or unreadable files
+    are pruned.
+    """
+    partials = []
+    new_cache = {path: entry for path, entry in cache.items() if os.path.exists(path)}
+    errors = {}
+    stale = []
+
+    for path in db_paths:
+        try:
+            mtime_ns, size = file_signature(path)
+        except OSError as e:
+            errors[path] = str(e)
+            new_cache.pop(path, None)
+            continue
+
+        entry = cache.get(path)
+        if entry and entry["mtime_ns"] == mtime_ns and entry["size"] == size:
+            partials.append(entry["partial"])
+            new_cache[path] = entry
+        else:
+            stale.append((path, mtime_ns, size))
+
+    reused = len(partials)
+
+    if stale:
+        signatures = {path: (mtime_ns, size) for path, mtime_ns, size in stale}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Larger chunks keep IPC overhead low when there are hundreds of files
+            chunksize = max(1, len(stale) // ((workers or os.cpu_count() or 1) * 4))
+            results = pool.map(aggregate_database, list(signatures), chunksize=chunksize)
+            for path, partial, error in results:
+                if error:
+                    errors[path] = error
+                    new_cache.pop(path, None)
+                    continue
+                mtime_ns, size = signatures[path]
+                partials.append(partial)
+                new_cache[path] = {"mtime_ns": mtime_ns, "size": size, "partial": partial}
+
+    return partials, new_cache, errors, reused
+
+def build_report(combined, db_count, errors=None):
+    total = combined["total"]
+    statuses = combined["statuses"]
+    responded = statuses["Interview"] + statuses["Offer"]
+    response_rate = (responded / total) * 100 if total else 0.0
+    return {
+        "databases": db_count,
+        "skipped": len(errors or {}),
+        "skipped_paths": sorted(errors or {}),
+        "total": total,
+        "response_rate": round(response_rate, 1),
+        "statuses": statuses,
+        "priorities": combined["priorities"],
+    }
+
+# ==========================================
+# OUTPUT
+# ==========================================
+def write_csv(report, file_path):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Metric", "Value"])
+        writer.writerow(["Databases", report["databases"]])
+        writer.writerow(["Skipped", report["skipped"]])
+        writer.writerow(["Total", report["total"]])
+        writer.writerow(["Response Rate (%)", report["response_rate"]])
+        for status, count in report["statuses"].items():
+            writer.writerow([f"Status: {status}", count])
+        for priority, count in report["priorities"].items():
+            writer.writerow([f"Priority: {priority}", count])
+        for path in report["skipped_paths"]:
+            writer.writerow(["Skipped Path", path])
+
+def write_json(report, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+def write_chart(report, file_path):
+    # Imported lazily with a non-GUI backend so the rollup stays headless
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5), dpi=100)
+    fig.subplots_adjust(wspace=0.3)
+    fig.suptitle(f"Team Rollup: {report['total']} apps across {report['databases']} databases")
+
+    # Chart 1: Status Distribution (same order/colors as the dashboard)
+    labels = ["Applied", "Interview", "Offer", "Rejected"]
+    colors = ['#95a5a6', '#3498db', '#2ecc71', '#e74c3c']
+    slices = [(l, report["statuses"][l], c) for l, c in zip(labels, colors) if report["statuses"][l] > 0]
+    if slices:
+        ax1.pie([s[1] for s in slices], labels=[s[0] for s in slices],
+                colors=[s[2] for s in slices], autopct='%1.1f%%', startangle=140)
+    ax1.set_title("Status Distribution")
+
+    # Chart 2: Priority Distribution
+    ax2.bar(PRIORITY_LEVELS, [report["priorities"][str(p)] for p in PRIORITY_LEVELS],
+            color='#f1c40f', edgecolor='grey')
+    ax2.set_title("Apps by Priority Level")
+    ax2.set_xlabel("Priority (Stars)")
+    ax2.set_ylabel("Count")
+    ax2.set_xticks(PRIORITY_LEVELS)
+    ax2.grid(axis='y', linestyle='--', alpha=0.5)
+
+    fig.savefig(file_path)
+    plt.close(fig)
+
+# ==========================================
+# ENTRY POINT
+# ==========================================
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not an integer")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Roll up many solsearch.db files into one team report.")
+    parser.add_argument("paths", nargs="+", help=f"Database files or directories to search for {DB_NAME}")
+    parser.add_argument("--workers", type=positive_int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--cache", default=CACHE_FILE, help=f"Per-file cache path (default: {CACHE_FILE})")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the cache")
+    parser.add_argument("--csv", help="Write the combined summary to this CSV file")
+    parser.add_argument("--json", help="Write the combined summary to this JSON file")
+    parser.add_argument("--chart", help="Save status/priority charts to this image file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    cache_path = None if args.no_cache else args.cache
+
+    db_paths = find_databases(args.paths)
+    if not db_paths:
+        print("No databases found.", file=sys.stderr)
+        return 1
+
+    cache = load_cache(cache_path)
+    partials, new_cache, errors, reused = collect_partials(db_paths, cache, args.workers)
+
+    for path, error in errors.items():
+        print(f"Warning: skipped {path}: {error}", file=sys.stderr)
+
+    if not partials:
+        # Every database failed; don't write a report that looks like an empty team
+        print("Error: no databases could be read.", file=sys.stderr)
+        save_cache(cache_path, new_cache)
+        return 1
+
+    report = build_report(merge_partials(partials), len(partials), errors)
+
+    print(f"Databases: {report['databases']} ({reused} cached, {len(errors)} skipped)")
+    print(f"Total: {report['total']}")
+    print(f"Response Rate: {report['response_rate']:.1f}%")
+    for status, count in report["statuses"].items():
+        print(f"  {status}: {count}")
+
+    if args.csv:
+        write_csv(report, args.csv)
+        print(f"CSV written to {args.csv}")
+    if args.json:
+        write_json(report, args.json)
+        print(f"JSON written to {args.json}")
+    if args.chart:
+        write_chart(report, args.chart)
+        print(f"Chart saved to {args.chart}")
+
+    # Saved last so a cache problem can never cost the user their report
+    save_cache(cache_path, new_cache)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+TESTS: rollup.py
+Builds a few temporary solsearch.db files and checks the merged report and cache reuse.
+"""
+
+import sqlite3
+import os
+import json
+
+import pytest
+
+import rollup
+
+# (status, priority) rows per teammate database
+TEAM_ROWS = {
+    "alice": [("Applied", 1), ("Interview", 5), ("Offer", 4), ("Rejected", 2)],
+    "bob": [("Applied", 3), ("Applied", 3), ("Rejected", 1)],
+    "carol": [("Interview", 2), ("Offer", 5), ("Applied", 4), ("Rejected", 5), ("Applied", 1)],
+}
+
+
+def create_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company TEXT NOT NULL,
+            role TEXT NOT NULL,
+            date_applied TEXT NOT NULL,
+            status TEXT NOT NULL,
+            priority INTEGER NOT NULL
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO applications (company, role, date_applied, status, priority) VALUES (?, ?, ?, ?, ?)",
+        [("Acme", "Engineer", "2026-01-01", status, priority) for status, priority in rows]
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def team_dir(tmp_path):
+    for name, rows in TEAM_ROWS.items():
+        (tmp_path / name).mkdir()
+        create_db(tmp_path / name / rollup.DB_NAME, rows)
+    return tmp_path
+
+
+def direct_counts(db_paths):
+    """Recomputes the expected figures with plain SELECTs, independent of rollup."""
+    total = responded = 0
+    for path in db_paths:
+        conn = sqlite3.connect(path)
+        total += conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+        responded += conn.execute(
+            "SELECT COUNT(*) FROM applications WHERE status IN ('Interview', 'Offer')"
+        ).fetchone()[0]
+        conn.close()
+    return total, round(responded / total * 100, 1)
+
+
+def test_merged_report_matches_direct_select(team_dir):
+    db_paths = rollup.find_databases([str(team_dir)])
+    assert len(db_paths) == 3
+
+    partials, _, errors, _ = rollup.collect_partials(db_paths, {}, workers=2)
+    report = rollup.build_report(rollup.merge_partials(partials), len(partials), errors)
+
+    total, response_rate = direct_counts(db_paths)
+    assert report["total"] == total
+    assert report["response_rate"] == response_rate
+    assert report["statuses"] == {"Applied": 5, "Interview": 2, "Rejected": 3, "Offer": 2}
+    assert report["priorities"] == {"1": 3, "2": 2, "3": 2, "4": 2, "5": 3}
+    assert report["skipped"] == 0
+
+
+def test_second_run_reuses_cache_and_only_rereads_changed_file(team_dir, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    db_paths = rollup.find_databases([str(team_dir)])
+
+    _, new_cache, _, reused = rollup.collect_partials(db_paths, rollup.load_cache(cache_path), workers=2)
+    rollup.save_cache(cache_path, new_cache)
+    assert reused == 0
+
+    _, new_cache, _, reused = rollup.collect_partials(db_paths, rollup.load_cache(cache_path), workers=2)
+    rollup.save_cache(cache_path, new_cache)
+    assert reused == 3
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    changed = str(team_dir / "bob" / rollup.DB_NAME)
+    create_db(changed, [("Offer", 5)] * 50)
+
+    partials, new_cache, _, reused = rollup.collect_partials(db_paths, rollup.load_cache(cache_path), workers=2)
+    assert reused == 2
+    assert new_cache[changed]["partial"]["statuses"]["Offer"] == 50
+    assert rollup.merge_partials(partials)["total"] == direct_counts(db_paths)[0]
+
+
+def test_malformed_and_deleted_cache_entries_are_dropped(team_dir, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    db_paths = rollup.find_databases([str(team_dir)])
+    _, new_cache, _, _ = rollup.collect_partials(db_paths, {}, workers=2)
+    new_cache["/gone/solsearch.db"] = new_cache[db_paths[0]]
+    del new_cache[db_paths[1]]["size"]
+    rollup.save_cache(cache_path, new_cache)
+
+    cache = rollup.load_cache(cache_path)
+    assert db_paths[1] not in cache
+
+    _, new_cache, _, reused = rollup.collect_partials(db_paths, cache, workers=2)
+    assert reused == 2
+    assert "/gone/solsearch.db" not in new_cache
+
+
+def test_main_fails_when_every_database_is_skipped(tmp_path):
+    (tmp_path / rollup.DB_NAME).write_text("junk")
+    out = tmp_path / "out.json"
+    assert rollup.main([str(tmp_path), "--no-cache", "--json", str(out)]) == 1
+    assert not out.exists()
+
+
+def test_main_still_reports_when_cache_cannot_be_written(team_dir, tmp_path, capsys):
+    (team_dir / "broken").mkdir()
+    (team_dir / "broken" / rollup.DB_NAME).write_text("junk")
+    out = tmp_path / "out.json"
+    bad_cache = str(tmp_path / "missing" / "cache.json")
+
+    assert rollup.main([str(team_dir), "--cache", bad_cache, "--json", str(out)]) == 0
+    assert "could not write cache" in capsys.readouterr().err
+
+    report = json.loads(out.read_text())
+    assert report["databases"] == 3
+    assert report["skipped"] == 1
+    assert report["skipped_paths"] == [str(team_dir / "broken" / rollup.DB_NAME)]